@@ -6,7 +6,8 @@ This agent demonstrates:
 3. Simple calculator operations (add, subtract, multiply, divide)
 """
 
-import re
+import asyncio
+import threading
 import uuid
 from typing import AsyncGenerator
 
@@ -18,101 +19,100 @@ from mlflow.types.responses import (
     ResponsesAgentStreamEvent,
 )
 
+from .calculator import parse_and_calculate
 
-def parse_and_calculate(expression: str) -> str:
-    """Parse natural language math expression and return result."""
-    expression = expression.lower().strip()
-
-    # Extract numbers from expression
-    numbers = re.findall(r'-?\d+\.?\d*', expression)
-    if len(numbers) < 2:
-        return f"Error: Need at least two numbers. Found: {numbers}"
-
-    a, b = float(numbers[0]), float(numbers[1])
-
-    # Determine operation
-    if any(op in expression for op in ['add', 'plus', 'sum', '+']):
-        result = a + b
-        op = '+'
-    elif any(op in expression for op in ['subtract', 'minus', 'difference', '-']):
-        result = a - b
-        op = '-'
-    elif any(op in expression for op in ['multiply', 'times', 'product', '*', 'x']):
-        result = a * b
-        op = '*'
-    elif any(op in expression for op in ['divide', 'divided', 'quotient', '/']):
-        if b == 0:
-            return "Error: Division by zero"
-        result = a / b
-        op = '/'
-    else:
-        return f"Error: Unknown operation. Supported: add, subtract, multiply, divide"
-
-    # Format result
-    if result == int(result):
-        result = int(result)
-    return f"{a} {op} {b} = {result}"
-
-
-def extract_user_message(messages: list) -> str:
-    """Extract the last user message from input."""
-    for msg in reversed(messages):
-        if msg.get("role") == "user":
-            content = msg.get("content", "")
+
+def _field(item, name: str, default=None):
+    """Read a field from a pydantic input item or a plain dict."""
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
+
+
+def extract_user_message(inputs) -> str:
+    """Extract the last user message from request input items."""
+    for msg in reversed(inputs):
+        if _field(msg, "role") == "user":
+            content = _field(msg, "content", "")
             if isinstance(content, str):
                 return content
             elif isinstance(content, list):
                 for block in content:
-                    if isinstance(block, dict) and block.get("type") == "text":
-                        return block.get("text", "")
+                    if _field(block, "type") == "text":
+                        return _field(block, "text", "")
     return ""
 
 
-@invoke()
-async def invoke(request: ResponsesAgentRequest) -> ResponsesAgentResponse:
-    """Handle non-streaming invocation."""
+# Prefix identifying which platform answered
+_RESPONSE_PREFIX = "[Databricks] "
+
+# The app's Service Principal identity is fixed for the process lifetime,
+# so it is looked up once and reused by every request
+_sp_info = None
+_sp_lock = threading.Lock()
+
+
+def get_service_principal():
+    """Look up the app's Service Principal identity (blocking SDK call, cached)."""
+    global _sp_info
+    if _sp_info is None:
+        with _sp_lock:
+            if _sp_info is None:
+                ws_client = WorkspaceClient()
+                _sp_info = ws_client.current_user.me()
+    return _sp_info
+
+
+async def aget_service_principal():
+    """Async wrapper for get_service_principal() that skips the thread hop once cached."""
+    if _sp_info is not None:
+        return _sp_info
+    return await asyncio.to_thread(get_service_principal)
+
+
+# Fields shared by every assistant output item
+_OUTPUT_ITEM_TEMPLATE = {"type": "message", "role": "assistant"}
+
+
+def _output_item(text: str) -> dict:
+    """Build an assistant message item (needs a unique id and output_text content)."""
+    return {
+        **_OUTPUT_ITEM_TEMPLATE,
+        "id": str(uuid.uuid4()),
+        "content": [{"type": "output_text", "text": text}],
+    }
+
+
+async def _build_response_text(request: ResponsesAgentRequest) -> str:
+    """Compute the reply text shared by invoke() and stream()."""
     # Use the app's Service Principal for authentication
-    ws_client = WorkspaceClient()
-    sp_info = ws_client.current_user.me()
+    await aget_service_principal()
 
-    messages = [m.model_dump() for m in request.input]
-    expression = extract_user_message(messages)
+    expression = extract_user_message(request.input)
     result = parse_and_calculate(expression)
 
-    # Include agent type and SP info
-    response_text = f"[Databricks] {result}"
+    # Include agent type
+    return _RESPONSE_PREFIX + result
+
+
+@invoke()
+async def invoke(request: ResponsesAgentRequest) -> ResponsesAgentResponse:
+    """Handle non-streaming invocation."""
+    response_text = await _build_response_text(request)
 
     # ResponsesAgentResponse requires id and output_text content type
     return ResponsesAgentResponse(
-        output=[{
-            "type": "message",
-            "id": str(uuid.uuid4()),
-            "role": "assistant",
-            "content": [{"type": "output_text", "text": response_text}]
-        }]
+        output=[_output_item(response_text)]
     )
 
 
 @stream()
 async def stream(request: ResponsesAgentRequest) -> AsyncGenerator[ResponsesAgentStreamEvent, None]:
     """Handle streaming invocation."""
-    # Use the app's Service Principal for authentication
-    ws_client = WorkspaceClient()
-    sp_info = ws_client.current_user.me()
-
-    messages = [m.model_dump() for m in request.input]
-    expression = extract_user_message(messages)
-    result = parse_and_calculate(expression)
-
-    response_text = f"[Databricks] {result}"
+    response_text = await _build_response_text(request)
 
     # Stream the response with proper format (id and output_text content type)
     yield ResponsesAgentStreamEvent(
         type="response.output_item.done",
-        item={
-            "type": "message",
-            "id": str(uuid.uuid4()),
-            "role": "assistant",
-            "content": [{"type": "output_text", "text": response_text}]
-        }
+        item=_output_item(response_text)
     )
@@ -0,0 +1,72 @@
+"""Natural-language calculator used by the Calculator Agent.
+
+Kept free of mlflow and Databricks imports so it can be tested on its own.
+"""
+
+import operator
+import re
+from functools import lru_cache
+
+# Numbers in the expression, e.g. "5", "-3", "2.5"
+_NUM_RE = re.compile(r'-?\d+\.?\d*')
+# Alphabetic tokens, so keywords are matched as whole words in one pass
+_WORD_RE = re.compile(r'[a-z]+')
+
+# Operator keyword -> operator symbol
+_OP_MAP = {
+    'add': '+', 'added': '+', 'adding': '+', 'addition': '+', 'plus': '+', 'sum': '+',
+    'subtract': '-', 'subtracted': '-', 'subtracting': '-', 'subtraction': '-',
+    'minus': '-', 'difference': '-',
+    'multiply': '*', 'multiplied': '*', 'multiplying': '*', 'multiplication': '*',
+    'times': '*', 'product': '*', 'x': '*',
+    'divide': '/', 'divided': '/', 'dividing': '/', 'division': '/', 'quotient': '/',
+}
+_SYMBOLS = frozenset('+-*/')
+# Deletes every ASCII character except the operator symbols
+_KEEP_SYMBOLS = str.maketrans('', '', ''.join(c for c in map(chr, range(128)) if c not in _SYMBOLS))
+# Operator symbol -> implementation
+_OPS = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv}
+# When several operators appear, add wins over subtract, then multiply, then divide
+_PRECEDENCE = '+-*/'
+
+
+def _classify_operator(expression: str):
+    """Return the operator symbol for an expression, or None if there is none."""
+    found = {_OP_MAP[w] for w in _WORD_RE.findall(expression) if w in _OP_MAP}
+    found.update(_SYMBOLS.intersection(expression.translate(_KEEP_SYMBOLS)))
+    for op in _PRECEDENCE:
+        if op in found:
+            return op
+    return None
+
+
+def parse_and_calculate(expression: str) -> str:
+    """Parse natural language math expression and return result."""
+    # Normalize case and whitespace so equivalent inputs share a cache entry
+    return _calculate(" ".join(expression.lower().split()))
+
+
+@lru_cache(maxsize=1024)
+def _calculate(expression: str) -> str:
+    """Evaluate a normalized expression (memoized; results are pure strings)."""
+    # Extract numbers from expression
+    numbers = _NUM_RE.findall(expression)
+    if len(numbers) < 2:
+        return f"Error: Need at least two numbers. Found: {numbers}"
+
+    a, b = float(numbers[0]), float(numbers[1])
+
+    # Determine operation
+    op = _classify_operator(expression)
+    if op is None:
+        return f"Error: Unknown operation. Supported: add, subtract, multiply, divide"
+    if op == '/' and b == 0:
+        return "Error: Division by zero"
+    result = _OPS[op](a, b)
+
+    # Format result
+    if result.is_integer():
+        result = int(result)
+    return f"{a} {op} {b} = {result}"
+
+
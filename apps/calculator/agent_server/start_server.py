@@ -1,9 +1,13 @@
 """Start the MLflow AgentServer for the Calculator agent."""
 
+import logging
+
 from mlflow.genai.agent_server import AgentServer
 
 # Import agent to register the @invoke and @stream functions
-import agent_server.agent  # noqa: F401
+from agent_server.agent import get_service_principal
+
+logger = logging.getLogger(__name__)
 
 # Create the agent server
 agent_server = AgentServer("ResponsesAgent")
@@ -14,6 +18,14 @@ app = agent_server.app
 
 def main():
     """Run the agent server."""
+    # Resolve the Service Principal before serving so the first request
+    # doesn't pay for WorkspaceClient config discovery and the identity lookup.
+    # A failure here must not block startup; requests retry the lookup lazily.
+    try:
+        get_service_principal()
+    except Exception as e:
+        logger.warning("Service Principal warm-up failed, will retry on first request: %s", e)
+
     agent_server.run(app_import_string="agent_server.start_server:app")
 
 
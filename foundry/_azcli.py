@@ -0,0 +1,51 @@
+"""
+Shared Azure CLI token helper for the Foundry scripts.
+
+Runs `az account get-access-token` and caches the token per resource until
+shortly before it expires, so repeated calls don't respawn the CLI.
+"""
+
+import json
+import shutil
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+# resource -> (access token, expiry as epoch seconds)
+_TOKEN_CACHE = {}
+_TOKEN_LOCK = threading.Lock()
+
+
+def fetch_az_token(resource):
+    """Get a fresh access token for resource from the Azure CLI.
+
+    Returns (token, expiry as epoch seconds). Raises subprocess.CalledProcessError
+    if az fails (e.g. not logged in) and OSError if az is not installed.
+    """
+    result = subprocess.run(
+        # Resolve the executable so az.cmd is found on Windows without a shell
+        [shutil.which("az") or "az", "account", "get-access-token", "--resource", resource, "-o", "json"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    token_info = json.loads(result.stdout)
+    if "expires_on" in token_info:
+        expiry = float(token_info["expires_on"])
+    else:
+        # Older az versions only report local time, e.g. "2025-01-01 12:00:00.000000"
+        expiry = datetime.strptime(
+            token_info["expiresOn"], "%Y-%m-%d %H:%M:%S.%f"
+        ).timestamp()
+    return token_info["accessToken"], expiry
+
+
+def get_az_token(resource, margin=60):
+    """Get an access token for resource, reusing it until margin seconds before expiry."""
+    with _TOKEN_LOCK:
+        cached = _TOKEN_CACHE.get(resource)
+        if cached and time.time() < cached[1] - margin:
+            return cached[0]
+        _TOKEN_CACHE[resource] = fetch_az_token(resource)
+        return _TOKEN_CACHE[resource][0]
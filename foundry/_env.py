@@ -0,0 +1,36 @@
+"""
+Shared .env loader for the Foundry scripts.
+
+Loads KEY=VALUE pairs from the repository-root .env into os.environ without
+overriding variables that are already set.
+"""
+
+import os
+import re
+
+ENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+
+# KEY=VALUE lines; surrounding whitespace is dropped, comments and blank lines never match
+_LINE_RE = re.compile(r"^[^\S\n]*([A-Za-z_][A-Za-z0-9_]*)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.MULTILINE)
+
+# Paths already applied to os.environ in this process -> parsed pairs (None if missing)
+_LOADED = {}
+
+
+def load_env(env_path=ENV_PATH):
+    """Load environment variables from .env file (once per process per path).
+
+    Returns the KEY -> VALUE pairs read from the file, or None if it does not exist.
+    """
+    # Key on the resolved path so different spellings of one file share an entry
+    env_path = os.path.realpath(env_path)
+    if env_path in _LOADED:
+        return _LOADED[env_path]
+    values = None
+    if os.path.exists(env_path):
+        with open(env_path) as f:
+            values = dict(_LINE_RE.findall(f.read()))
+        for key, value in values.items():
+            os.environ.setdefault(key, value)
+    _LOADED[env_path] = values
+    return values
@@ -11,27 +11,30 @@ Usage:
 import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from foundry._env import load_env  # noqa: E402
 
-def load_env():
-    """Load environment variables from .env file."""
-    env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    os.environ.setdefault(key.strip(), value.strip())
+
+# Shared credential; constructing one probes the whole credential chain
+_CREDENTIAL = None
+
+
+def _credential():
+    """Get the shared DefaultAzureCredential, creating it on first use."""
+    global _CREDENTIAL
+    if _CREDENTIAL is None:
+        from azure.identity import DefaultAzureCredential
+        _CREDENTIAL = DefaultAzureCredential()
+    return _CREDENTIAL
 
 
 def create_agent():
     """Create the Foundry agent with Databricks MCP tools."""
     from azure.ai.projects import AIProjectClient
     from azure.ai.projects.models import PromptAgentDefinition, MCPTool
-    from azure.identity import DefaultAzureCredential
 
     endpoint = os.environ.get("AZURE_AI_PROJECT_ENDPOINT")
     if not endpoint:
@@ -51,7 +54,7 @@ def create_agent():
     print(f"  Connection: {connection_name}")
     print(f"  Model: {model}")
 
-    credential = DefaultAzureCredential()
+    credential = _credential()
 
     with AIProjectClient(endpoint=endpoint, credential=credential) as client:
         mcp_tool = MCPTool(
@@ -88,22 +91,27 @@ Use the appropriate tool based on the user's request.""",
 def delete_agent():
     """Delete all versions of the agent."""
     from azure.ai.projects import AIProjectClient
-    from azure.identity import DefaultAzureCredential
 
     endpoint = os.environ.get("AZURE_AI_PROJECT_ENDPOINT")
     if not endpoint:
         print("Error: AZURE_AI_PROJECT_ENDPOINT not set in .env")
         sys.exit(1)
 
-    credential = DefaultAzureCredential()
+    credential = _credential()
 
     with AIProjectClient(endpoint=endpoint, credential=credential) as client:
         try:
-            # List and delete all versions
+            # List and delete all versions; deletes are independent, so run them concurrently
             versions = list(client.agents.list_versions("databricks-mcp-agent"))
-            for v in versions:
-                client.agents.delete_version("databricks-mcp-agent", v.version)
-                print(f"Deleted version {v.version}")
+            if versions:
+                with ThreadPoolExecutor(max_workers=min(16, len(versions))) as executor:
+                    futures = {
+                        executor.submit(client.agents.delete_version, "databricks-mcp-agent", v.version): v
+                        for v in versions
+                    }
+                    for future in as_completed(futures):
+                        future.result()
+                        print(f"Deleted version {futures[future].version}")
             print("Agent deleted")
         except Exception as e:
             print(f"Error deleting agent: {e}")
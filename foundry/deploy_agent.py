@@ -28,6 +28,8 @@ import sys
 # Add parent directory to path for loading .env
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from foundry._env import load_env  # noqa: E402
+
 try:
     from azure.ai.projects import AIProjectClient
     from azure.ai.agents.models import McpTool
@@ -38,16 +40,16 @@ except ImportError as e:
     sys.exit(1)
 
 
-def load_env():
-    """Load environment variables from .env file."""
-    env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    os.environ.setdefault(key.strip(), value.strip())
+# Shared credential; constructing one probes the whole credential chain
+_CREDENTIAL = None
+
+
+def _credential():
+    """Get the shared DefaultAzureCredential, creating it on first use."""
+    global _CREDENTIAL
+    if _CREDENTIAL is None:
+        _CREDENTIAL = DefaultAzureCredential()
+    return _CREDENTIAL
 
 
 def get_config():
@@ -125,7 +127,7 @@ def create_agent(config):
     print(f"  Allowed Tools:      {allowed_tools}")
 
     # Initialize project client using connection string (for hub-based projects)
-    credential = DefaultAzureCredential()
+    credential = _credential()
 
     project_client = AIProjectClient.from_connection_string(
         conn_str=config["connection_string"],
@@ -205,7 +207,7 @@ def delete_agent(config):
 
     print(f"Deleting agent: {agent_id}")
 
-    credential = DefaultAzureCredential()
+    credential = _credential()
 
     project_client = AIProjectClient.from_connection_string(
         conn_str=config["connection_string"],
@@ -10,42 +10,36 @@ Usage:
 """
 
 import argparse
-import json
 import os
 import subprocess
 import sys
-import urllib.request
-import urllib.error
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-
-def load_env():
-    """Load environment variables from .env file."""
-    env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    os.environ.setdefault(key.strip(), value.strip())
+from foundry._azcli import get_az_token  # noqa: E402
+from foundry._env import load_env  # noqa: E402
 
 
 ASSISTANT_NAME = "simple-chat-agent"
 API_VERSION = "2025-05-01"
 
+# Shared HTTP session so consecutive API calls reuse one TLS connection
+_SESSION = None
+
+
+def _session():
+    """Get the shared requests session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        _SESSION = requests.Session()
+    return _SESSION
+
 
 def get_azure_token():
-    """Get Azure AD token for AI Foundry."""
+    """Get Azure AD token for AI Foundry, reusing it until shortly before expiry."""
     try:
-        result = subprocess.run(
-            ["az", "account", "get-access-token", "--resource", "https://ai.azure.com", "--query", "accessToken", "-o", "tsv"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
+        return get_az_token("https://ai.azure.com")
     except subprocess.CalledProcessError as e:
         print(f"Error getting Azure token: {e.stderr}")
         print("Run 'az login' first.")
@@ -54,21 +48,19 @@ def get_azure_token():
 
 def api_call(method, endpoint, path, token, body=None):
     """Make REST API call to Foundry."""
-    url = f"{endpoint}{path}?api-version={API_VERSION}"
+    url = f"{endpoint}{path}"
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
-    data = json.dumps(body).encode() if body else None
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
 
-    try:
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read().decode())
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode() if e.fp else str(e)
-        print(f"HTTP {e.code}: {error_body}")
+    resp = _session().request(
+        method, url, params={"api-version": API_VERSION}, headers=headers, json=body, timeout=30
+    )
+    if not resp.ok:
+        print(f"HTTP {resp.status_code}: {resp.text}")
         return None
+    return resp.json() if resp.content else {}
 
 
 def create_agent():
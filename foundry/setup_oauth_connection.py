@@ -29,30 +29,31 @@ Environment Variables (from .env):
 import argparse
 import json
 import os
+import shutil
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 
 # Add parent dir for .env
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from foundry._azcli import get_az_token  # noqa: E402
+from foundry._env import ENV_PATH, load_env as _load_env_file  # noqa: E402
+
 
 def load_env():
     """Load environment variables from .env file."""
-    env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    os.environ.setdefault(key.strip(), value.strip())
-        print(f"[OK] Loaded .env from {env_path}")
+    if _load_env_file() is not None:
+        print(f"[OK] Loaded .env from {ENV_PATH}")
     else:
-        print(f"[WARN] No .env file at {env_path}")
+        print(f"[WARN] No .env file at {ENV_PATH}")
 
 
+@lru_cache(maxsize=1)
 def get_config():
-    """Get configuration from environment."""
+    """Get configuration from environment (read-only, built once per process)."""
     load_env()
 
     required = ["DATABRICKS_HOST", "SUBSCRIPTION_ID", "RESOURCE_GROUP"]
@@ -65,43 +66,97 @@ def get_config():
     catalog = os.environ.get("UC_CATALOG", "mcp_agents")
     schema = os.environ.get("UC_SCHEMA", "tools")
     prefix = os.environ.get("PREFIX", "mcpagent01")
+    subscription_id = os.environ["SUBSCRIPTION_ID"]
+    resource_group = os.environ["RESOURCE_GROUP"]
+    project_name = f"proj-{prefix}"
+    connection_name = "databricks-oauth"
 
-    return {
+    return MappingProxyType({
         "databricks_host": databricks_host,
         "account_id": os.environ.get("DATABRICKS_ACCOUNT_ID"),
-        "subscription_id": os.environ["SUBSCRIPTION_ID"],
-        "resource_group": os.environ["RESOURCE_GROUP"],
-        "project_name": f"proj-{prefix}",
+        "subscription_id": subscription_id,
+        "resource_group": resource_group,
+        "project_name": project_name,
         "catalog": catalog,
         "schema": schema,
         "mcp_server_url": f"{databricks_host}/api/2.0/mcp/functions/{catalog}/{schema}",
         "oauth_app_name": "foundry-mcp-oauth",
-        "connection_name": "databricks-oauth",
+        "connection_name": connection_name,
+        # ARM resource for the Foundry connection
+        "connection_url": (
+            f"https://management.azure.com/subscriptions/{subscription_id}"
+            f"/resourceGroups/{resource_group}"
+            f"/providers/Microsoft.MachineLearningServices/workspaces/{project_name}"
+            f"/connections/{connection_name}"
+        ),
+        "arm_api_version": "2024-04-01-preview",
         # Databricks OIDC endpoints
         "auth_url": f"{databricks_host}/oidc/v1/authorize",
         "token_url": f"{databricks_host}/oidc/v1/token",
-    }
+    })
 
 
-def run_command(cmd, capture=True):
-    """Run a shell command and return output."""
+def run_command(argv, capture=True, quiet=False):
+    """Run a command (argv list, no shell) and return output.
+
+    With quiet=True the command's stderr is discarded.
+    """
+    pipe = subprocess.PIPE if capture else None
+    # Resolve the executable so wrappers like az.cmd are found on Windows without a shell
+    argv = [shutil.which(argv[0]) or argv[0], *argv[1:]]
     try:
         result = subprocess.run(
-            cmd, shell=True, capture_output=capture, text=True
+            argv, stdout=pipe, stderr=subprocess.DEVNULL if quiet else pipe, text=True
         )
         if result.returncode != 0 and capture:
-            print(f"[WARN] Command failed: {result.stderr}")
+            print(f"[WARN] Command failed: {result.stderr or ''}")
         return result.stdout.strip() if capture else None
     except Exception as e:
         print(f"[ERROR] Command failed: {e}")
         return None
 
 
+# Shared HTTP session so consecutive ARM calls reuse one TLS connection
+_SESSION = None
+
+
+def _session():
+    """Get the shared requests session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        _SESSION = requests.Session()
+        _SESSION.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            # raise_on_status=False hands back the last response so callers can report its status
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                              raise_on_status=False),
+        ))
+    return _SESSION
+
+
+# Azure AD resource IDs
+AZURE_MANAGEMENT_RESOURCE = "https://management.azure.com/"
+DATABRICKS_RESOURCE = "2ff814a6-3304-4ab8-85cb-cd0e6f879c1d"
+
+def _get_token(resource):
+    """Get an access token for resource via Azure CLI, or None if az fails."""
+    try:
+        return get_az_token(resource)
+    except subprocess.CalledProcessError as e:
+        print(f"[WARN] Command failed: {e.stderr}")
+    except OSError as e:
+        print(f"[ERROR] Command failed: {e}")
+    return None
+
+
 def get_azure_token():
     """Get Azure Management API token."""
-    token = run_command(
-        "az account get-access-token --resource https://management.azure.com/ --query accessToken -o tsv"
-    )
+    token = _get_token(AZURE_MANAGEMENT_RESOURCE)
     if not token:
         print("[ERROR] Failed to get Azure token. Run: az login")
         sys.exit(1)
@@ -110,9 +165,7 @@ def get_azure_token():
 
 def get_databricks_token():
     """Get Databricks token via Azure CLI."""
-    token = run_command(
-        "az account get-access-token --resource 2ff814a6-3304-4ab8-85cb-cd0e6f879c1d --query accessToken -o tsv"
-    )
+    token = _get_token(DATABRICKS_RESOURCE)
     if not token:
         print("[ERROR] Failed to get Databricks token. Run: az login")
         sys.exit(1)
@@ -124,7 +177,10 @@ def list_oauth_apps(config):
     print("\n=== Checking Existing Databricks OAuth Apps ===")
 
     # Use Databricks CLI to list custom app integrations
-    result = run_command("databricks account custom-app-integration list --output json 2>/dev/null")
+    result = run_command(
+        ["databricks", "account", "custom-app-integration", "list", "--output", "json"],
+        quiet=True,
+    )
 
     if result:
         try:
@@ -169,8 +225,9 @@ def create_databricks_oauth_app(config, redirect_urls=None):
     print(f"Scopes: all-apis")
 
     # Try using Databricks CLI
-    cmd = f"databricks account custom-app-integration create --json '{json.dumps(app_config)}'"
-    result = run_command(cmd)
+    result = run_command(
+        ["databricks", "account", "custom-app-integration", "create", "--json", json.dumps(app_config)]
+    )
 
     if result:
         try:
@@ -241,14 +298,8 @@ def create_foundry_oauth_connection(config, client_id, client_secret):
     print(f"Token URL: {config['token_url']}")
 
     # Create connection via ARM API
-    import requests
-
-    url = (
-        f"https://management.azure.com/subscriptions/{config['subscription_id']}"
-        f"/resourceGroups/{config['resource_group']}"
-        f"/providers/Microsoft.MachineLearningServices/workspaces/{config['project_name']}"
-        f"/connections/{config['connection_name']}?api-version=2024-04-01-preview"
-    )
+    url = config["connection_url"]
+    params = {"api-version": config["arm_api_version"]}
 
     headers = {
         "Authorization": f"Bearer {token}",
@@ -257,7 +308,7 @@ def create_foundry_oauth_connection(config, client_id, client_secret):
 
     print(f"\nSending request to: {url}")
 
-    resp = requests.put(url, headers=headers, json=connection_payload)
+    resp = _session().put(url, params=params, headers=headers, json=connection_payload, timeout=(5, 30))
 
     if resp.status_code in [200, 201]:
         result = resp.json()
@@ -282,18 +333,12 @@ def get_connection_status(config):
 
     token = get_azure_token()
 
-    import requests
-
-    url = (
-        f"https://management.azure.com/subscriptions/{config['subscription_id']}"
-        f"/resourceGroups/{config['resource_group']}"
-        f"/providers/Microsoft.MachineLearningServices/workspaces/{config['project_name']}"
-        f"/connections/{config['connection_name']}?api-version=2024-04-01-preview"
-    )
+    url = config["connection_url"]
+    params = {"api-version": config["arm_api_version"]}
 
     headers = {"Authorization": f"Bearer {token}"}
 
-    resp = requests.get(url, headers=headers)
+    resp = _session().get(url, params=params, headers=headers, timeout=(5, 30))
 
     if resp.status_code == 200:
         result = resp.json()
@@ -328,18 +373,12 @@ def delete_connection(config):
 
     token = get_azure_token()
 
-    import requests
-
-    url = (
-        f"https://management.azure.com/subscriptions/{config['subscription_id']}"
-        f"/resourceGroups/{config['resource_group']}"
-        f"/providers/Microsoft.MachineLearningServices/workspaces/{config['project_name']}"
-        f"/connections/{config['connection_name']}?api-version=2024-04-01-preview"
-    )
+    url = config["connection_url"]
+    params = {"api-version": config["arm_api_version"]}
 
     headers = {"Authorization": f"Bearer {token}"}
 
-    resp = requests.delete(url, headers=headers)
+    resp = _session().delete(url, params=params, headers=headers, timeout=(5, 30))
 
     if resp.status_code in [200, 204]:
         print(f"[OK] Connection '{config['connection_name']}' deleted")
@@ -361,8 +400,10 @@ def update_databricks_oauth_app(config, integration_id, redirect_url):
         "redirect_urls": [redirect_url]
     }
 
-    cmd = f"databricks account custom-app-integration update {integration_id} --json '{json.dumps(update_config)}'"
-    result = run_command(cmd)
+    result = run_command(
+        ["databricks", "account", "custom-app-integration", "update", integration_id,
+         "--json", json.dumps(update_config)]
+    )
 
     if result:
         print(f"[OK] OAuth app updated with redirect URL: {redirect_url}")
@@ -390,8 +431,16 @@ def create_full_oauth_setup(config):
     print(f"  Foundry Project: {config['project_name']}")
     print(f"  Connection Name: {config['connection_name']}")
 
+    # Fetch the ARM token while the databricks CLI lists OAuth apps; both are non-interactive
+    executor = ThreadPoolExecutor(max_workers=1)
+    azure_token = executor.submit(get_azure_token)
+    executor.shutdown(wait=False)
+
     # Step 1: Check/Create Databricks OAuth app
     apps = list_oauth_apps(config)
+    # Join before any prompt or app creation so an az failure neither interleaves
+    # with secret entry nor leaves a freshly created OAuth app behind
+    azure_token.result()
     existing_app = next((a for a in apps if a.get("name") == config["oauth_app_name"]), None)
 
     if existing_app:
@@ -418,7 +467,7 @@ def create_full_oauth_setup(config):
         print("[ERROR] Missing client_id or client_secret")
         return False
 
-    # Step 2: Create Foundry connection
+    # Step 2: Create Foundry connection (token is cached by the background fetch)
     result = create_foundry_oauth_connection(config, client_id, client_secret)
 
     if not result:
@@ -7,43 +7,81 @@ Tests each component separately to identify where the failure occurs:
 3. Responses API with agent reference (Foundry 2.0 style)
 
 Usage:
-    python test_mcp_debug.py
+    python test_mcp_debug.py             # Run the tests one after another
+    python test_mcp_debug.py --parallel  # Run them concurrently (no consent prompt)
 
 Requires:
     pip install azure-ai-projects azure-identity openai python-dotenv requests
     az login
 """
 
+import argparse
 import os
 import sys
 import json
+import time
 import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
 
 # Add parent dir for .env
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from foundry._env import ENV_PATH, load_env as _load_env_file  # noqa: E402
+
+# Shared HTTP session so back-to-back MCP calls reuse one TLS connection
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
+# Connection attributes logged by TEST-3 (set MCP_DEBUG_FULL_INTROSPECT=1 to log all of them)
+CONNECTION_DEBUG_ATTRS = ("name", "id", "connection_type", "target", "metadata")
+
 
 def load_env():
     """Load environment variables from .env file."""
-    env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    os.environ.setdefault(key.strip(), value.strip())
-        print(f"[OK] Loaded .env from {env_path}")
+    if _load_env_file() is not None:
+        print(f"[OK] Loaded .env from {ENV_PATH}")
     else:
-        print(f"[WARN] No .env file at {env_path}")
+        print(f"[WARN] No .env file at {ENV_PATH}")
+
+
+@dataclass(frozen=True, slots=True)
+class McpDebugConfig:
+    """Settings shared by the debug tests, read once from the environment."""
+    databricks_host: str
+    catalog: str
+    schema: str
+    mcp_url: str
+    project_endpoint: str
+    connection_name: str
+    model: str
+
+
+@lru_cache(maxsize=1)
+def _config() -> McpDebugConfig:
+    """Build the debug config from the environment (after load_env)."""
+    databricks_host = os.environ.get("DATABRICKS_HOST", "").rstrip("/")
+    catalog = os.environ.get("UC_CATALOG", "mcp_agents")
+    schema = os.environ.get("UC_SCHEMA", "tools")
+    return McpDebugConfig(
+        databricks_host=databricks_host,
+        catalog=catalog,
+        schema=schema,
+        mcp_url=f"{databricks_host}/api/2.0/mcp/functions/{catalog}/{schema}",
+        project_endpoint=os.environ.get("AZURE_AI_PROJECT_ENDPOINT", ""),
+        connection_name=os.environ.get("MCP_PROJECT_CONNECTION_NAME", "databricks_mcp"),
+        model=os.environ.get("MODEL_DEPLOYMENT_NAME", "gpt-4o"),
+    )
+
+
+_LEVEL_SYMBOL = {"INFO": "[*]", "OK": "[+]", "FAIL": "[-]", "DEBUG": "[D]"}
 
 
 def log(step, msg, level="INFO"):
     """Print timestamped log message."""
-    ts = datetime.now().strftime("%H:%M:%S")
-    symbol = {"INFO": "[*]", "OK": "[+]", "FAIL": "[-]", "DEBUG": "[D]"}.get(level, "[*]")
-    print(f"{ts} {symbol} [{step}] {msg}")
+    print(f"{time.strftime('%H:%M:%S')} {_LEVEL_SYMBOL.get(level, '[*]')} [{step}] {msg}")
 
 
 def test_1_direct_mcp_call():
@@ -51,13 +89,9 @@ def test_1_direct_mcp_call():
     log("TEST-1", "Direct MCP Server Call (bypass Foundry)")
     log("TEST-1", "-" * 50)
 
-    databricks_host = os.environ.get("DATABRICKS_HOST", "").rstrip("/")
-    catalog = os.environ.get("UC_CATALOG", "mcp_agents")
-    schema = os.environ.get("UC_SCHEMA", "tools")
-
-    mcp_url = f"{databricks_host}/api/2.0/mcp/functions/{catalog}/{schema}"
+    cfg = _config()
 
-    log("TEST-1", f"MCP URL: {mcp_url}")
+    log("TEST-1", f"MCP URL: {cfg.mcp_url}")
 
     # Get Databricks token from Azure CLI
     try:
@@ -85,7 +119,7 @@ def test_1_direct_mcp_call():
     }
 
     try:
-        resp = requests.post(mcp_url, headers=headers, json=payload, timeout=30)
+        resp = _SESSION.post(cfg.mcp_url, headers=headers, json=payload, timeout=30)
         log("TEST-1", f"Response status: {resp.status_code}")
 
         if resp.status_code == 200:
@@ -106,7 +140,7 @@ def test_1_direct_mcp_call():
 
     # Test 1b: Call calculator tool
     log("TEST-1", "Calling calculator_agent tool...")
-    tool_name = f"{catalog}__{schema}__calculator_agent"
+    tool_name = f"{cfg.catalog}__{cfg.schema}__calculator_agent"
     payload = {
         "jsonrpc": "2.0",
         "id": "2",
@@ -118,7 +152,7 @@ def test_1_direct_mcp_call():
     }
 
     try:
-        resp = requests.post(mcp_url, headers=headers, json=payload, timeout=60)
+        resp = _SESSION.post(cfg.mcp_url, headers=headers, json=payload, timeout=60)
         log("TEST-1", f"Response status: {resp.status_code}")
 
         if resp.status_code == 200:
@@ -136,7 +170,10 @@ def test_1_direct_mcp_call():
 
 
 def test_2_project_client():
-    """Test 2: Verify Azure AI Project client connection."""
+    """Test 2: Verify Azure AI Project client connection.
+
+    Returns (success, client, endpoint); client and endpoint are None on failure.
+    """
     log("TEST-2", "Azure AI Project Client Connection")
     log("TEST-2", "-" * 50)
 
@@ -146,7 +183,7 @@ def test_2_project_client():
     except ImportError as e:
         log("TEST-2", f"Import error: {e}", "FAIL")
         log("TEST-2", "Run: pip install azure-ai-projects azure-identity")
-        return False
+        return False, None, None
 
     # Try multiple endpoint formats
     endpoints_to_try = []
@@ -198,8 +235,11 @@ def test_2_project_client():
     return False, None, None
 
 
-def test_3_responses_api():
-    """Test 3: Use OpenAI Responses API with agent reference (Foundry 2.0 style)."""
+def test_3_responses_api(interactive=True):
+    """Test 3: Use OpenAI Responses API with agent reference (Foundry 2.0 style).
+
+    With interactive=False the OAuth consent prompt and retry are skipped.
+    """
     log("TEST-3", "Responses API with Agent Reference")
     log("TEST-3", "-" * 50)
 
@@ -213,28 +253,21 @@ def test_3_responses_api():
         return False
 
     # Need project endpoint for Foundry 2.0
-    endpoint = os.environ.get("AZURE_AI_PROJECT_ENDPOINT")
-    if not endpoint:
+    cfg = _config()
+    if not cfg.project_endpoint:
         log("TEST-3", "AZURE_AI_PROJECT_ENDPOINT not set", "FAIL")
         log("TEST-3", "Set it to: https://<resource>.services.ai.azure.com/api/projects/<project>")
         return False
 
-    databricks_host = os.environ.get("DATABRICKS_HOST", "").rstrip("/")
-    catalog = os.environ.get("UC_CATALOG", "mcp_agents")
-    schema = os.environ.get("UC_SCHEMA", "tools")
-    mcp_url = f"{databricks_host}/api/2.0/mcp/functions/{catalog}/{schema}"
-    connection_name = os.environ.get("MCP_PROJECT_CONNECTION_NAME", "databricks_mcp")
-    model = os.environ.get("MODEL_DEPLOYMENT_NAME", "gpt-4o")
-
-    log("TEST-3", f"Endpoint: {endpoint}")
-    log("TEST-3", f"MCP URL: {mcp_url}")
-    log("TEST-3", f"Connection: {connection_name}")
-    log("TEST-3", f"Model: {model}")
+    log("TEST-3", f"Endpoint: {cfg.project_endpoint}")
+    log("TEST-3", f"MCP URL: {cfg.mcp_url}")
+    log("TEST-3", f"Connection: {cfg.connection_name}")
+    log("TEST-3", f"Model: {cfg.model}")
 
     credential = DefaultAzureCredential()
 
     try:
-        with AIProjectClient(endpoint=endpoint, credential=credential) as project_client:
+        with AIProjectClient(endpoint=cfg.project_endpoint, credential=credential) as project_client:
             # List available connections to verify databricks_mcp exists
             log("TEST-3", "Listing project connections...")
             try:
@@ -243,7 +276,7 @@ def test_3_responses_api():
                 for conn in connections:
                     conn_type = getattr(conn, 'connection_type', 'unknown')
                     log("TEST-3", f"  - {conn.name} (type: {conn_type})")
-                    if conn.name == connection_name:
+                    if conn.name == cfg.connection_name:
                         log("TEST-3", f"    ^ This is our MCP connection!", "OK")
             except Exception as e:
                 log("TEST-3", f"Could not list connections: {e}", "DEBUG")
@@ -264,25 +297,26 @@ def test_3_responses_api():
             # Check connection details for the databricks connection
             log("TEST-3", "Checking connection properties...")
             try:
+                full_introspect = os.environ.get("MCP_DEBUG_FULL_INTROSPECT") == "1"
                 for conn in connections:
                     log("TEST-3", f"Connection '{conn.name}' properties:")
-                    for attr in dir(conn):
-                        if not attr.startswith('_'):
-                            try:
-                                val = getattr(conn, attr)
-                                if not callable(val):
-                                    log("TEST-3", f"    {attr}: {val}")
-                            except:
-                                pass
+                    if full_introspect:
+                        attrs = [a for a in dir(conn) if not a.startswith('_')]
+                    else:
+                        attrs = CONNECTION_DEBUG_ATTRS
+                    for attr in attrs:
+                        val = getattr(conn, attr, None)
+                        if not callable(val):
+                            log("TEST-3", f"    {attr}: {val}")
             except Exception as e:
                 log("TEST-3", f"Could not inspect connections: {e}", "DEBUG")
 
             # Define MCP tool
             mcp_tool = MCPTool(
                 server_label="databricks_mcp",
-                server_url=mcp_url,
+                server_url=cfg.mcp_url,
                 require_approval="never",
-                project_connection_id=connection_name,
+                project_connection_id=cfg.connection_name,
             )
             log("TEST-3", f"MCP Tool: {mcp_tool}", "DEBUG")
 
@@ -290,7 +324,7 @@ def test_3_responses_api():
             agent = project_client.agents.create_version(
                 agent_name="mcp-debug-test",
                 definition=PromptAgentDefinition(
-                    model=model,
+                    model=cfg.model,
                     instructions="Use the epic_patient_search tool to search for patients. Always use tools.",
                     tools=[mcp_tool],
                 ),
@@ -301,7 +335,7 @@ def test_3_responses_api():
                 # Call via Responses API
                 log("TEST-3", "Sending request via Responses API...")
                 response = openai_client.responses.create(
-                    model=model,
+                    model=cfg.model,
                     input=[{"role": "user", "content": "Search for patients with family name Argonaut"}],
                     extra_body={
                         "agent": {"name": agent.name, "type": "agent_reference"}
@@ -348,13 +382,16 @@ def test_3_responses_api():
                             log("TEST-3", f"  {consent_link}")
                             log("TEST-3", "")
 
+                if oauth_consent_items and not interactive:
+                    log("TEST-3", "Skipping consent retry (non-interactive); complete consent and rerun without --parallel")
+                elif oauth_consent_items:
                     # Wait for user to complete consent
                     input("Press Enter after completing OAuth consent in your browser...")
 
                     # Retry the request after consent
                     log("TEST-3", "Retrying request after OAuth consent...")
                     response = openai_client.responses.create(
-                        model=model,
+                        model=cfg.model,
                         input=[{"role": "user", "content": "Search for patients with family name Argonaut"}],
                         extra_body={
                             "agent": {"name": agent.name, "type": "agent_reference"},
@@ -406,6 +443,11 @@ def test_3_responses_api():
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Debug Foundry + Databricks MCP integration")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run the tests concurrently (TEST-3 skips the interactive consent retry)")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Foundry + Databricks MCP Debug Script")
     print("=" * 60)
@@ -427,15 +469,26 @@ def main():
     results = {}
 
     # Run tests
-    print("\n" + "=" * 60)
-    results["TEST-1"] = test_1_direct_mcp_call()
+    if args.parallel:
+        # The tests hit independent services, so overlap their network waits
+        print("\n" + "=" * 60)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                "TEST-1": executor.submit(test_1_direct_mcp_call),
+                "TEST-2": executor.submit(lambda: test_2_project_client()[0]),
+                "TEST-3": executor.submit(test_3_responses_api, interactive=False),
+            }
+            results = {test: future.result() for test, future in futures.items()}
+    else:
+        print("\n" + "=" * 60)
+        results["TEST-1"] = test_1_direct_mcp_call()
 
-    print("\n" + "=" * 60)
-    success, _, _ = test_2_project_client()
-    results["TEST-2"] = success
+        print("\n" + "=" * 60)
+        success, _, _ = test_2_project_client()
+        results["TEST-2"] = success
 
-    print("\n" + "=" * 60)
-    results["TEST-3"] = test_3_responses_api()
+        print("\n" + "=" * 60)
+        results["TEST-3"] = test_3_responses_api()
 
     # Summary
     print("\n" + "=" * 60)
@@ -14,29 +14,29 @@ Usage:
 import json
 import os
 import sys
+import threading
 import time
-import urllib.request
-import urllib.error
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from foundry._azcli import fetch_az_token  # noqa: E402
+from foundry._env import load_env  # noqa: E402
 
-def load_env():
-    """Load environment variables from .env file."""
-    env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    os.environ.setdefault(key.strip(), value.strip())
-
+# Run status polling: exponential backoff from 0.1 s, capped at 2 s, for up to 60 s
+POLL_INITIAL_DELAY = 0.1
+POLL_MAX_DELAY = 2.0
+POLL_TIMEOUT = 60.0
 
-# Load environment
-load_env()
+# Largest response body read into memory; the run/message payloads are far smaller
+_MAX_RESP_BYTES = 4 * 1024 * 1024
 
 
 def setup_tracing():
@@ -64,67 +64,146 @@ def setup_tracing():
         return None
 
 
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; None if absent or an HTTP date."""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=1)
+def _resolved() -> Tuple[str, str, str]:
+    """Resolve (endpoint, agent_id, api_version) from the environment once per process."""
+    load_env()
+    endpoint = os.environ.get("AZURE_AI_PROJECT_ENDPOINT")
+    agent_id = os.environ.get("FOUNDRY_AGENT_ID")
+    if not endpoint:
+        raise ValueError("AZURE_AI_PROJECT_ENDPOINT not set")
+    if not agent_id:
+        raise ValueError("FOUNDRY_AGENT_ID not set")
+    return endpoint, agent_id, "2025-05-01"
+
+
+def _read_capped(resp: requests.Response) -> Tuple[bytes, bool]:
+    """Read a streamed response body up to _MAX_RESP_BYTES.
+
+    Returns (content, truncated); the connection is released either way.
+    """
+    chunks = []
+    size = 0
+    with resp:
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > _MAX_RESP_BYTES:
+                return b"".join(chunks), True
+            chunks.append(chunk)
+    return b"".join(chunks), False
+
+
 class TracedFoundryClient:
     """Client for calling Azure AI Foundry agents with tracing."""
 
     def __init__(self, tracer=None):
-        self.endpoint = os.environ.get("AZURE_AI_PROJECT_ENDPOINT")
-        self.agent_id = os.environ.get("FOUNDRY_AGENT_ID")
-        self.api_version = "2025-05-01"
-        self.tracer = tracer or setup_tracing()
-
-        if not self.endpoint:
-            raise ValueError("AZURE_AI_PROJECT_ENDPOINT not set")
-        if not self.agent_id:
-            raise ValueError("FOUNDRY_AGENT_ID not set")
+        self.endpoint, self.agent_id, self.api_version = _resolved()
+
+        # Tracing (Azure Monitor exporter) is configured on the first chat, not here
+        self.tracer = tracer
+        self._tracer_initialized = tracer is not None
+
+        # Pooled session so every step of a chat reuses one HTTPS connection
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=8,
+            # raise_on_status=False hands back the last response so raise_for_status reports it
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504],
+                              raise_on_status=False),
+        ))
+
+        # Cached Azure AD token and its expiry (epoch seconds)
+        self._token = None
+        self._token_exp = 0.0
+        self._token_lock = threading.Lock()
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _ensure_tracer(self):
+        """Configure tracing the first time it is needed."""
+        if not self._tracer_initialized:
+            self.tracer = setup_tracing()
+            self._tracer_initialized = True
 
     def _get_token(self) -> str:
-        """Get Azure AD token for AI Foundry."""
-        import subprocess
-        result = subprocess.run(
-            ["az", "account", "get-access-token", "--resource", "https://ai.azure.com", "--query", "accessToken", "-o", "tsv"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
-
-    def _api_call(self, method: str, path: str, body: Optional[dict] = None, span_name: str = "api_call") -> dict:
-        """Make REST API call to Foundry with tracing."""
-        url = f"{self.endpoint}{path}?api-version={self.api_version}"
+        """Get Azure AD token for AI Foundry, reusing it until 5 minutes before expiry."""
+        with self._token_lock:
+            if self._token and time.time() < self._token_exp - 300:
+                return self._token
+            self._token, self._token_exp = fetch_az_token("https://ai.azure.com")
+            return self._token
+
+    def _api_call(self, method: str, path: str, body: Optional[dict] = None, span_name: str = "api_call",
+                  with_headers: bool = False, params: Optional[dict] = None):
+        """Make REST API call to Foundry with tracing.
+
+        params are added to the query string alongside api-version. Returns the
+        decoded JSON body, or (body, response headers) when with_headers is True.
+        Bodies over _MAX_RESP_BYTES are rejected with ValueError.
+        """
+        query = {"api-version": self.api_version, **(params or {})}
+        url = f"{self.endpoint}{path}?{urlencode(query)}"
         token = self._get_token()
         headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
-        data = json.dumps(body).encode() if body else None
+        # Serialize once; the span attribute reuses the same string
+        body_json = json.dumps(body) if body else None
+        data = body_json.encode() if body_json else None
 
         # Wrap in trace span if tracer is available
         if self.tracer:
             with self.tracer.start_as_current_span(span_name) as span:
-                span.set_attribute("http.method", method)
-                span.set_attribute("http.url", url)
-                span.set_attribute("ai.agent_id", self.agent_id)
-                if body:
-                    span.set_attribute("ai.request_body", json.dumps(body)[:1000])
+                attrs = {"http.method": method, "http.url": url, "ai.agent_id": self.agent_id}
+                if body_json:
+                    attrs["ai.request_body"] = body_json[:1000]
+                span.set_attributes(attrs)
 
                 try:
-                    req = urllib.request.Request(url, data=data, headers=headers, method=method)
-                    with urllib.request.urlopen(req) as resp:
-                        response_text = resp.read().decode()
-                        span.set_attribute("http.status_code", resp.status)
-                        span.set_attribute("ai.response_body", response_text[:1000])
-                        return json.loads(response_text)
-                except urllib.error.HTTPError as e:
-                    error_body = e.read().decode() if e.fp else str(e)
-                    span.set_attribute("http.status_code", e.code)
-                    span.set_attribute("error", True)
-                    span.set_attribute("error.message", error_body[:500])
+                    resp = self._session.request(method, url, headers=headers, data=data,
+                                                 timeout=(5, 30), stream=True)
+                    resp.raise_for_status()
+                    content, truncated = _read_capped(resp)
+                    span.set_attributes({
+                        "http.status_code": resp.status_code,
+                        "ai.response_body": content[:1000].decode("utf-8", "replace"),
+                        "ai.response_truncated": truncated,
+                    })
+                except requests.HTTPError as e:
+                    span.set_attributes({
+                        "http.status_code": e.response.status_code,
+                        "error": True,
+                        "error.message": e.response.text[:500],
+                    })
                     raise
         else:
-            req = urllib.request.Request(url, data=data, headers=headers, method=method)
-            with urllib.request.urlopen(req) as resp:
-                return json.loads(resp.read().decode())
+            resp = self._session.request(method, url, headers=headers, data=data,
+                                         timeout=(5, 30), stream=True)
+            resp.raise_for_status()
+            content, truncated = _read_capped(resp)
+
+        if truncated:
+            raise ValueError(f"{method} {path}: response exceeds {_MAX_RESP_BYTES} bytes")
+        result = json.loads(content)
+        return (result, resp.headers) if with_headers else result
 
     def chat(self, message: str, session_id: Optional[str] = None) -> dict:
         """
@@ -137,49 +216,56 @@ class TracedFoundryClient:
         Returns:
             dict with 'response', 'thread_id', 'run_id', and trace info
         """
+        self._ensure_tracer()
         parent_span_name = f"foundry_agent_chat"
 
         if self.tracer:
             with self.tracer.start_as_current_span(parent_span_name) as parent_span:
-                parent_span.set_attribute("ai.agent_id", self.agent_id)
-                parent_span.set_attribute("ai.user_message", message[:500])
-                parent_span.set_attribute("ai.session_id", session_id or "new")
+                parent_span.set_attributes({
+                    "ai.agent_id": self.agent_id,
+                    "ai.user_message": message[:500],
+                    "ai.session_id": session_id or "new",
+                })
 
                 result = self._execute_chat(message, session_id)
 
-                parent_span.set_attribute("ai.thread_id", result.get("thread_id", ""))
-                parent_span.set_attribute("ai.run_id", result.get("run_id", ""))
-                parent_span.set_attribute("ai.status", result.get("status", ""))
+                result_attrs = {
+                    "ai.thread_id": result.get("thread_id", ""),
+                    "ai.run_id": result.get("run_id", ""),
+                    "ai.status": result.get("status", ""),
+                    "ai.poll_count": result.get("poll_count", 0),
+                }
                 if result.get("response"):
-                    parent_span.set_attribute("ai.response", result["response"][:500])
+                    result_attrs["ai.response"] = result["response"][:500]
+                parent_span.set_attributes(result_attrs)
 
                 return result
         else:
             return self._execute_chat(message, session_id)
 
     def _execute_chat(self, message: str, session_id: Optional[str] = None) -> dict:
-        """Execute the chat flow: create thread, add message, run, poll, get response."""
+        """Execute the chat flow: create thread and run, poll, get response."""
         try:
-            # Step 1: Create thread
-            thread = self._api_call("POST", "/threads", {}, "create_thread")
-            thread_id = thread.get("id")
-
-            # Step 2: Add message
-            self._api_call("POST", f"/threads/{thread_id}/messages", {
-                "role": "user",
-                "content": message
-            }, "add_message")
-
-            # Step 3: Create run
-            run = self._api_call("POST", f"/threads/{thread_id}/runs", {
-                "assistant_id": self.agent_id
-            }, "create_run")
+            # Steps 1-3: Create thread with the user message and start a run in one call
+            run = self._api_call("POST", "/threads/runs", {
+                "assistant_id": self.agent_id,
+                "thread": {
+                    "messages": [{"role": "user", "content": message}]
+                }
+            }, "create_thread_and_run")
+            thread_id = run.get("thread_id")
             run_id = run.get("id")
 
-            # Step 4: Poll for completion
+            # Step 4: Poll for completion, backing off exponentially or as the service asks
             status = "in_progress"
-            for _ in range(30):
-                run_status = self._api_call("GET", f"/threads/{thread_id}/runs/{run_id}", span_name="poll_run_status")
+            poll_count = 0
+            delay = POLL_INITIAL_DELAY
+            deadline = time.monotonic() + POLL_TIMEOUT
+            while True:
+                run_status, resp_headers = self._api_call(
+                    "GET", f"/threads/{thread_id}/runs/{run_id}", span_name="poll_run_status", with_headers=True
+                )
+                poll_count += 1
                 status = run_status.get("status")
                 if status == "completed":
                     break
@@ -188,12 +274,20 @@ class TracedFoundryClient:
                         "status": status,
                         "error": run_status.get("last_error", {}),
                         "thread_id": thread_id,
-                        "run_id": run_id
+                        "run_id": run_id,
+                        "poll_count": poll_count
                     }
-                time.sleep(1)
+                wait = _retry_after_seconds(resp_headers.get("Retry-After"))
+                if wait is None:
+                    wait = delay
+                    delay = min(delay * 2, POLL_MAX_DELAY)
+                if time.monotonic() + wait > deadline:
+                    break
+                time.sleep(wait)
 
-            # Step 5: Get messages
-            messages = self._api_call("GET", f"/threads/{thread_id}/messages", span_name="get_messages")
+            # Step 5: Get the newest message from this run (the assistant reply)
+            messages = self._api_call("GET", f"/threads/{thread_id}/messages", span_name="get_messages",
+                                      params={"limit": 1, "order": "desc", "run_id": run_id})
             assistant_response = None
             for msg in messages.get("data", []):
                 if msg.get("role") == "assistant":
@@ -206,7 +300,8 @@ class TracedFoundryClient:
                 "status": "success",
                 "response": assistant_response,
                 "thread_id": thread_id,
-                "run_id": run_id
+                "run_id": run_id,
+                "poll_count": poll_count
             }
 
         except Exception as e:
@@ -3,12 +3,34 @@ Agents for Databricks Agent Interoperability Framework.
 
 - databricks: Databricks agents using UC Functions as MCP tools
 - foundry: Azure AI Foundry MCP integration
+
+Exports are imported on first access, so using the Foundry clients does not
+pull in mlflow, pyspark and langchain from the Databricks agent.
 """
-from .databricks import DatabricksMCPAgent
-from .foundry import FoundryMCPClient, FoundryAgentClient
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .databricks import DatabricksMCPAgent
+    from .foundry import FoundryMCPClient, FoundryAgentClient
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "DatabricksMCPAgent": ".databricks",
+    "FoundryMCPClient": ".foundry",
+    "FoundryAgentClient": ".foundry",
+}
 
 __all__ = [
     "DatabricksMCPAgent",
     "FoundryMCPClient",
     "FoundryAgentClient",
 ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -91,13 +91,13 @@ class DatabricksMCPAgent:
         params_str = ", ".join(params)
         query = f"SELECT {full_name}({params_str})"
 
-        logger.debug(f"Executing UC function: {query}")
+        logger.debug("Executing UC function: %s", query)
 
         try:
             result = self.spark.sql(query).collect()[0][0]
             return result
         except Exception as e:
-            logger.error(f"UC function call failed: {e}")
+            logger.error("UC function call failed: %s", e)
             return json.dumps({"error": str(e)})
 
     def call_foundry_agent(
@@ -0,0 +1,25 @@
+"""
+Shared HTTP session factory for the Foundry clients.
+
+A pooled session keeps TCP/TLS connections alive across the many small
+requests each client makes (thread create, message, run, polling, MCP calls).
+"""
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_session(pool_maxsize: int = 10) -> requests.Session:
+    """
+    Create a requests session with a keep-alive connection pool.
+
+    Args:
+        pool_maxsize: Max connections kept open per host
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
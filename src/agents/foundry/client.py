@@ -11,7 +11,7 @@ import time
 from typing import Optional
 from dataclasses import dataclass
 
-import requests
+from ._http import create_session
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +44,8 @@ class FoundryAgentClient:
         self,
         endpoint: Optional[str] = None,
         token: Optional[str] = None,
-        timeout: int = 60
+        timeout: int = 60,
+        pool_maxsize: int = 10
     ):
         """
         Initialize the Foundry client.
@@ -53,10 +54,12 @@ class FoundryAgentClient:
             endpoint: Foundry endpoint URL (or AZURE_AI_FOUNDRY_ENDPOINT env var)
             token: Entra ID token (or will attempt to get from Databricks context)
             timeout: Max seconds to wait for agent response
+            pool_maxsize: Max keep-alive connections to the Foundry endpoint
         """
         self.endpoint = endpoint or os.getenv("AZURE_AI_FOUNDRY_ENDPOINT")
         self._token = token
         self.timeout = timeout
+        self._session = create_session(pool_maxsize)
 
         if not self.endpoint:
             raise ValueError(
@@ -105,6 +108,10 @@ class FoundryAgentClient:
             "api-version": "2024-12-01-preview"
         }
 
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self._session.close()
+
     def create_thread(self, agent_name: str) -> str:
         """
         Create a new conversation thread.
@@ -116,7 +123,7 @@ class FoundryAgentClient:
             Thread ID
         """
         url = f"{self.endpoint}/agents/{agent_name}/threads"
-        response = requests.post(url, headers=self._headers(), json={})
+        response = self._session.post(url, headers=self._headers(), json={})
         response.raise_for_status()
         return response.json().get("id")
 
@@ -140,7 +147,7 @@ class FoundryAgentClient:
             Message response
         """
         url = f"{self.endpoint}/agents/{agent_name}/threads/{thread_id}/messages"
-        response = requests.post(
+        response = self._session.post(
             url,
             headers=self._headers(),
             json={"role": role, "content": message}
@@ -160,7 +167,7 @@ class FoundryAgentClient:
             Run ID
         """
         url = f"{self.endpoint}/agents/{agent_name}/threads/{thread_id}/runs"
-        response = requests.post(
+        response = self._session.post(
             url,
             headers=self._headers(),
             json={"assistant_id": agent_name}
@@ -190,10 +197,10 @@ class FoundryAgentClient:
             RuntimeError: If run fails
         """
         url = f"{self.endpoint}/agents/{agent_name}/threads/{thread_id}/runs/{run_id}"
-        start_time = time.time()
+        deadline = time.monotonic() + self.timeout
 
-        while time.time() - start_time < self.timeout:
-            response = requests.get(url, headers=self._headers())
+        while time.monotonic() < deadline:
+            response = self._session.get(url, headers=self._headers())
             response.raise_for_status()
             data = response.json()
             status = data.get("status")
@@ -225,7 +232,7 @@ class FoundryAgentClient:
             List of messages
         """
         url = f"{self.endpoint}/agents/{agent_name}/threads/{thread_id}/messages"
-        response = requests.get(
+        response = self._session.get(
             url,
             headers=self._headers(),
             params={"order": "desc", "limit": limit}
@@ -257,14 +264,14 @@ class FoundryAgentClient:
             # Create thread if needed
             if not thread_id:
                 thread_id = self.create_thread(agent_name)
-                logger.debug(f"Created thread: {thread_id}")
+                logger.debug("Created thread: %s", thread_id)
 
             # Add message
             self.add_message(agent_name, thread_id, message)
 
             # Run agent
             run_id = self.run_agent(agent_name, thread_id)
-            logger.debug(f"Started run: {run_id}")
+            logger.debug("Started run: %s", run_id)
 
             # Wait for completion
             self.wait_for_completion(agent_name, thread_id, run_id)
@@ -296,7 +303,7 @@ class FoundryAgentClient:
             )
 
         except Exception as e:
-            logger.error(f"Foundry agent call failed: {e}")
+            logger.error("Foundry agent call failed: %s", e)
             return FoundryResponse(
                 status="error",
                 agent_name=agent_name,
@@ -7,10 +7,12 @@ Enables Foundry agents to use UC Functions as MCP tools.
 import json
 import logging
 import os
+import threading
+import time
 from typing import Any, Optional
 from dataclasses import dataclass
 
-import requests
+from ._http import create_session
 
 logger = logging.getLogger(__name__)
 
@@ -48,12 +50,17 @@ class FoundryMCPClient:
     # Databricks resource ID for token acquisition
     DATABRICKS_RESOURCE_ID = "2ff814a6-3304-4ab8-85cb-cd0e6f879c1d"
 
+    # Refresh Azure Identity tokens this many seconds before they expire
+    TOKEN_REFRESH_MARGIN = 300
+
     def __init__(
         self,
         workspace_url: Optional[str] = None,
         catalog: str = "mcp_agents",
         schema: str = "tools",
-        token: Optional[str] = None
+        token: Optional[str] = None,
+        tools_cache_ttl: float = 60.0,
+        pool_maxsize: int = 10
     ):
         """
         Initialize the MCP client.
@@ -63,6 +70,8 @@ class FoundryMCPClient:
             catalog: UC catalog containing MCP tool functions
             schema: UC schema containing MCP tool functions
             token: Entra ID token for Databricks (or will acquire automatically)
+            tools_cache_ttl: Seconds a discovered tools list stays fresh
+            pool_maxsize: Max keep-alive connections to the workspace
         """
         self.workspace_url = (
             workspace_url or
@@ -72,7 +81,12 @@ class FoundryMCPClient:
         self.catalog = catalog
         self.schema = schema
         self._token = token
-        self._tools_cache = None
+        self.tools_cache_ttl = tools_cache_ttl
+        self._tools_cache: Optional[tuple] = None  # (fetched_at, tools)
+        self._session = create_session(pool_maxsize)
+        self._credential = None
+        self._access_token = None  # azure.core AccessToken
+        self._token_lock = threading.Lock()
 
         if not self.workspace_url:
             raise ValueError(
@@ -98,12 +112,9 @@ class FoundryMCPClient:
 
         # Try Azure Identity (works in Foundry with managed identity)
         try:
-            from azure.identity import DefaultAzureCredential
-            credential = DefaultAzureCredential()
-            token = credential.get_token(f"{self.DATABRICKS_RESOURCE_ID}/.default")
-            return token.token
+            return self._get_azure_identity_token()
         except Exception as e:
-            logger.debug(f"Azure Identity failed: {e}")
+            logger.debug("Azure Identity failed: %s", e)
 
         # Fallback to environment
         token = os.getenv("DATABRICKS_TOKEN")
@@ -115,6 +126,27 @@ class FoundryMCPClient:
             "configured or set DATABRICKS_TOKEN environment variable."
         )
 
+    def _get_azure_identity_token(self) -> str:
+        """
+        Get a Databricks token from Azure Identity, reusing it until near expiry.
+
+        The lock makes concurrent callers wait for a single refresh instead of
+        each probing the credential chain.
+        """
+        with self._token_lock:
+            cached = self._access_token
+            if cached and cached.expires_on - self.TOKEN_REFRESH_MARGIN > time.time():
+                return cached.token
+
+            if self._credential is None:
+                from azure.identity import DefaultAzureCredential
+                self._credential = DefaultAzureCredential()
+
+            self._access_token = self._credential.get_token(
+                f"{self.DATABRICKS_RESOURCE_ID}/.default"
+            )
+            return self._access_token.token
+
     def _headers(self) -> dict:
         """Build request headers."""
         return {
@@ -140,7 +172,7 @@ class FoundryMCPClient:
             "params": params or {}
         }
 
-        response = requests.post(
+        response = self._session.post(
             self.mcp_endpoint,
             headers=self._headers(),
             json=request_body,
@@ -154,6 +186,10 @@ class FoundryMCPClient:
 
         return data.get("result", {})
 
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self._session.close()
+
     def list_tools(self, use_cache: bool = True) -> list:
         """
         List available MCP tools (UC Functions).
@@ -165,15 +201,21 @@ class FoundryMCPClient:
             List of tool definitions
         """
         if use_cache and self._tools_cache is not None:
-            return self._tools_cache
+            fetched_at, tools = self._tools_cache
+            if time.monotonic() - fetched_at < self.tools_cache_ttl:
+                return tools
 
         result = self._mcp_request("tools/list")
         tools = result.get("tools", [])
-        self._tools_cache = tools
+        self._tools_cache = (time.monotonic(), tools)
 
-        logger.info(f"Discovered {len(tools)} MCP tools from {self.catalog}.{self.schema}")
+        logger.info("Discovered %d MCP tools from %s.%s", len(tools), self.catalog, self.schema)
         return tools
 
+    def invalidate_tools_cache(self) -> None:
+        """Drop the cached tools list so the next list_tools() refetches it."""
+        self._tools_cache = None
+
     def call_tool(self, name: str, arguments: dict) -> MCPToolResult:
         """
         Call an MCP tool (UC Function).
@@ -208,7 +250,7 @@ class FoundryMCPClient:
             return MCPToolResult(success=True, content=None)
 
         except Exception as e:
-            logger.error(f"MCP tool call failed: {e}")
+            logger.error("MCP tool call failed: %s", e)
             return MCPToolResult(success=False, content=None, error=str(e))
 
     def echo(self, message: str) -> str:
@@ -0,0 +1,84 @@
+"""Tests for the Calculator Agent expression parser."""
+import pytest
+
+UNKNOWN = "Error: Unknown operation. Supported: add, subtract, multiply, divide"
+
+
+class TestOperatorClassification:
+    """Test how keywords and symbols map to an operator."""
+
+    @pytest.mark.parametrize("expression,expected", [
+        ("add 5 and 3", "5.0 + 3.0 = 8"),
+        ("what is 5 plus 3?", "5.0 + 3.0 = 8"),
+        ("subtract 3 from 10", "3.0 - 10.0 = -7"),
+        ("difference of 9 and 4", "9.0 - 4.0 = 5"),
+        ("multiplied 2 3", "2.0 * 3.0 = 6"),
+        ("2.5 times 2", "2.5 * 2.0 = 5"),
+        ("6 x 7", "6.0 * 7.0 = 42"),
+        ("10 divided by 2", "10.0 / 2.0 = 5"),
+        ("quotient of 7 and 2", "7.0 / 2.0 = 3.5"),
+    ])
+    def test_keywords(self, expression, expected):
+        """Keywords and their inflections select the operator."""
+        from apps.calculator.agent_server.calculator import parse_and_calculate
+        assert parse_and_calculate(expression) == expected
+
+    @pytest.mark.parametrize("expression,expected", [
+        ("5 + 4", "5.0 + 4.0 = 9"),
+        ("7 - 2", "7.0 - 2.0 = 5"),
+        ("5 * 4", "5.0 * 4.0 = 20"),
+        ("9 / 3", "9.0 / 3.0 = 3"),
+    ])
+    def test_symbols(self, expression, expected):
+        """Operator symbols select the operator."""
+        from apps.calculator.agent_server.calculator import parse_and_calculate
+        assert parse_and_calculate(expression) == expected
+
+    @pytest.mark.parametrize("expression", [
+        "maximum of 3 and 4",
+        "index 3 4",
+        "2 exp 3",
+        "foo 1 2",
+    ])
+    def test_keywords_match_whole_words(self, expression):
+        """Words that merely contain a keyword are not operators."""
+        from apps.calculator.agent_server.calculator import parse_and_calculate
+        assert parse_and_calculate(expression) == UNKNOWN
+
+    def test_input_is_normalized(self):
+        """Case and whitespace don't change the result."""
+        from apps.calculator.agent_server.calculator import parse_and_calculate
+        assert parse_and_calculate("  ADD   2\t3 ") == parse_and_calculate("add 2 3")
+
+
+class TestOperatorPrecedence:
+    """Test which operator wins when several appear."""
+
+    @pytest.mark.parametrize("expression,expected", [
+        ("add 2 and subtract 3", "+"),
+        ("subtract 2 times 3", "-"),
+        ("multiply 6 divided by 2", "*"),
+        ("divide 6 - 2", "-"),
+        ("6 * 2 plus", "+"),
+        ("divide 8 by 2", "/"),
+        ("8 and 2", None),
+    ])
+    def test_precedence(self, expression, expected):
+        """Add beats subtract, which beats multiply, which beats divide."""
+        from apps.calculator.agent_server.calculator import _classify_operator
+        assert _classify_operator(expression) == expected
+
+
+class TestCalculationErrors:
+    """Test the error messages returned instead of a result."""
+
+    @pytest.mark.parametrize("expression", ["10 / 0", "divide 1 by 0", "5 divided by 0.0"])
+    def test_division_by_zero(self, expression):
+        """Dividing by zero returns an error, not an exception."""
+        from apps.calculator.agent_server.calculator import parse_and_calculate
+        assert parse_and_calculate(expression) == "Error: Division by zero"
+
+    def test_needs_two_numbers(self):
+        """A single number is rejected."""
+        from apps.calculator.agent_server.calculator import parse_and_calculate
+        assert parse_and_calculate("add 5") == "Error: Need at least two numbers. Found: ['5']"
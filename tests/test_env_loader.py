@@ -0,0 +1,94 @@
+"""Tests for the shared .env loader used by the Foundry scripts."""
+import os
+
+import pytest
+
+KEYS = ["ENVTEST_A", "ENVTEST_B", "ENVTEST_C", "ENVTEST_EMPTY", "ENVTEST_SET", "FOO", "A", "B"]
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    """Unset the keys under test and restore them afterwards."""
+    from foundry import _env
+
+    monkeypatch.setattr(_env, "_LOADED", {})
+    for key in KEYS:
+        # setenv first so monkeypatch records the original value for undo
+        monkeypatch.setenv(key, "")
+        monkeypatch.delenv(key)
+    return monkeypatch
+
+
+def write_env(tmp_path, content, newline="\n"):
+    path = tmp_path / ".env"
+    path.write_bytes(content.replace("\n", newline).encode())
+    return str(path)
+
+
+class TestLoadEnv:
+    """Test parsing and applying .env files."""
+
+    def test_missing_file(self, clean_env, tmp_path):
+        """A missing file returns None."""
+        from foundry._env import load_env
+        assert load_env(str(tmp_path / ".env")) is None
+
+    def test_comments_and_blank_lines(self, clean_env, tmp_path):
+        """Comments and blank lines are skipped."""
+        from foundry._env import load_env
+
+        path = write_env(tmp_path, "# comment\n\n#ENVTEST_B=2\n   \nENVTEST_A=1\n")
+        assert load_env(path) == {"ENVTEST_A": "1"}
+        assert os.environ["ENVTEST_A"] == "1"
+        assert "ENVTEST_B" not in os.environ
+
+    def test_whitespace_is_trimmed(self, clean_env, tmp_path):
+        """Whitespace around keys and values is dropped."""
+        from foundry._env import load_env
+
+        path = write_env(tmp_path, "  ENVTEST_A = 1 \nENVTEST_B=\t two words\t\nENVTEST_EMPTY=\n")
+        assert load_env(path) == {"ENVTEST_A": "1", "ENVTEST_B": "two words", "ENVTEST_EMPTY": ""}
+
+    def test_equals_in_value(self, clean_env, tmp_path):
+        """Only the first = separates key and value."""
+        from foundry._env import load_env
+
+        path = write_env(tmp_path, "ENVTEST_A=x=y\nENVTEST_B=postgres://u:p@h/db?a=1&b=2\n")
+        assert load_env(path) == {"ENVTEST_A": "x=y", "ENVTEST_B": "postgres://u:p@h/db?a=1&b=2"}
+
+    def test_crlf_line_endings(self, clean_env, tmp_path):
+        """Windows line endings don't leak into values."""
+        from foundry._env import load_env
+
+        path = write_env(tmp_path, "ENVTEST_A=1\nENVTEST_B=two\n", newline="\r\n")
+        assert load_env(path) == {"ENVTEST_A": "1", "ENVTEST_B": "two"}
+        assert os.environ["ENVTEST_B"] == "two"
+
+    def test_existing_env_wins(self, clean_env, tmp_path):
+        """Variables already set are not overridden."""
+        from foundry._env import load_env
+
+        clean_env.setenv("ENVTEST_SET", "from-shell")
+        path = write_env(tmp_path, "ENVTEST_SET=from-file\nENVTEST_A=1\n")
+        assert load_env(path)["ENVTEST_SET"] == "from-file"
+        assert os.environ["ENVTEST_SET"] == "from-shell"
+        assert os.environ["ENVTEST_A"] == "1"
+
+    @pytest.mark.parametrize("line", ["export FOO=1", "A.B=1", "A-B=1", "1A=1", "=1"])
+    def test_invalid_keys_are_dropped(self, clean_env, tmp_path, line):
+        """Lines without a valid identifier key are ignored."""
+        from foundry._env import load_env
+
+        path = write_env(tmp_path, f"{line}\nENVTEST_A=1\n")
+        assert load_env(path) == {"ENVTEST_A": "1"}
+        for key in ("FOO", "A", "B"):
+            assert key not in os.environ
+
+    def test_loaded_once_per_path(self, clean_env, tmp_path):
+        """A second call reuses the first parse, even via another spelling of the path."""
+        from foundry._env import load_env
+
+        path = write_env(tmp_path, "ENVTEST_A=1\n")
+        first = load_env(path)
+        (tmp_path / ".env").write_text("ENVTEST_A=2\n")
+        assert load_env(os.path.join(str(tmp_path), ".", ".env")) is first
@@ -0,0 +1,146 @@
+"""Tests for the Foundry MCP client caches."""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("requests")
+
+
+class FakeClock:
+    """Stands in for the time module so tests control both clocks."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Patch the client's clock."""
+    from src.agents.foundry import mcp_client
+
+    fake = FakeClock()
+    monkeypatch.setattr(mcp_client, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def client():
+    """Client with a static token, so no credential is touched."""
+    from src.agents.foundry.mcp_client import FoundryMCPClient
+
+    c = FoundryMCPClient(workspace_url="https://example.azuredatabricks.net", token="t", tools_cache_ttl=60.0)
+    yield c
+    c.close()
+
+
+def stub_mcp_request(monkeypatch, client):
+    """Replace _mcp_request with a stub that records each call."""
+    calls = []
+
+    def fake(method, params=None):
+        calls.append(method)
+        return {"tools": [{"name": f"tool_{len(calls)}"}]}
+
+    monkeypatch.setattr(client, "_mcp_request", fake)
+    return calls
+
+
+class TestToolsCache:
+    """Test list_tools caching."""
+
+    def test_reuses_within_ttl(self, monkeypatch, client, clock):
+        """A second call inside the TTL reuses the cached list."""
+        calls = stub_mcp_request(monkeypatch, client)
+
+        first = client.list_tools()
+        clock.now += 59
+        assert client.list_tools() is first
+        assert calls == ["tools/list"]
+
+    def test_refetches_after_ttl(self, monkeypatch, client, clock):
+        """The list is fetched again once the TTL has passed."""
+        calls = stub_mcp_request(monkeypatch, client)
+
+        client.list_tools()
+        clock.now += 60
+        assert client.list_tools() == [{"name": "tool_2"}]
+        assert len(calls) == 2
+
+        # The refetch restarts the TTL
+        clock.now += 30
+        client.list_tools()
+        assert len(calls) == 2
+
+    def test_use_cache_false_bypasses(self, monkeypatch, client, clock):
+        """use_cache=False always fetches and refreshes the cache."""
+        calls = stub_mcp_request(monkeypatch, client)
+
+        client.list_tools()
+        assert client.list_tools(use_cache=False) == [{"name": "tool_2"}]
+        assert client.list_tools() == [{"name": "tool_2"}]
+        assert len(calls) == 2
+
+    def test_invalidate_tools_cache(self, monkeypatch, client, clock):
+        """invalidate_tools_cache() forces the next call to refetch."""
+        calls = stub_mcp_request(monkeypatch, client)
+
+        client.list_tools()
+        client.invalidate_tools_cache()
+        assert client.list_tools() == [{"name": "tool_2"}]
+        assert len(calls) == 2
+
+
+class FakeCredential:
+    """Credential stub that issues numbered tokens with a fixed lifetime."""
+
+    def __init__(self, clock, lifetime=3600):
+        self.clock = clock
+        self.lifetime = lifetime
+        self.scopes = []
+
+    def get_token(self, scope):
+        self.scopes.append(scope)
+        return SimpleNamespace(
+            token=f"token_{len(self.scopes)}",
+            expires_on=self.clock.now + self.lifetime,
+        )
+
+
+class TestAzureIdentityToken:
+    """Test Azure Identity token reuse."""
+
+    @pytest.fixture
+    def identity_client(self, clock):
+        from src.agents.foundry.mcp_client import FoundryMCPClient
+
+        c = FoundryMCPClient(workspace_url="example.azuredatabricks.net")
+        c._credential = FakeCredential(clock)
+        yield c
+        c.close()
+
+    def test_reuses_until_refresh_margin(self, identity_client, clock):
+        """The token is reused until TOKEN_REFRESH_MARGIN seconds before expiry."""
+        credential = identity_client._credential
+        margin = identity_client.TOKEN_REFRESH_MARGIN
+
+        assert identity_client._get_azure_identity_token() == "token_1"
+        clock.now += 3600 - margin - 1
+        assert identity_client._get_azure_identity_token() == "token_1"
+        assert len(credential.scopes) == 1
+
+        clock.now += 1
+        assert identity_client._get_azure_identity_token() == "token_2"
+        assert credential.scopes == [
+            f"{identity_client.DATABRICKS_RESOURCE_ID}/.default"
+        ] * 2
+
+    def test_token_property_uses_cache(self, identity_client, clock):
+        """Repeated token lookups hit the credential once."""
+        assert identity_client.token == identity_client.token == "token_1"
+        assert len(identity_client._credential.scopes) == 1